@@ -14,13 +14,16 @@ Uso:
                                [--dry-run] [-v]
 """
 import os
+import re
 import sys
 import argparse
 import logging
 import tempfile
+import functools
 from pathlib import Path
 from pathspec import PathSpec
-from fnmatch import fnmatch
+import fnmatch
+from cli_utils_UNIX import load_ignore_spec
 from detect_root import find_repo_root
 
 # Exclusiones por defecto
@@ -39,80 +42,160 @@ ALWAYS_EXCLUDE = {
     'node_modules/', 'node_modules/*', 'dist/', 'dist/*', 'build/', 'build/*', 'venv/', 'venv/*',
     '.mypy_cache/', '.mypy_cache/*', '.git/', '.git/*'
 }
+# Archivos/carpetas ocultos que sí se muestran en el árbol
+VISIBLE_DOTFILES = frozenset({'.gitignore', '.github'})
+# Buffer de escritura de estructura.txt (agrupa las líneas en pocas llamadas a write)
+WRITE_BUFFER_SIZE = 1 << 20
 
 
-def load_ignore_spec(repo_root: Path):
-    """Carga PathSpec desde .gitignore si existe."""
-    gitignore = repo_root / '.gitignore'
-    if not gitignore.is_file():
-        return None
-    lines = [
-        ln.strip() for ln in gitignore.read_text(encoding='utf-8').splitlines()
-        if ln.strip() and not ln.strip().startswith('#')
-    ]
-    if not lines:
-        return None
-    return PathSpec.from_lines('gitwildmatch', lines)
+# Metacaracteres de fnmatch; un patrón sin ellos es un literal
+_GLOB_CHARS = frozenset('*?[')
 
 
-def should_skip(path: Path, repo_root: Path, exclude_patterns, honor_gitignore: bool, ignore_spec: PathSpec):
-    rel = path.relative_to(repo_root).as_posix()
-    if path.is_dir() and not rel.endswith('/'):
-        rel += '/'
-    # .gitignore
-    if honor_gitignore and ignore_spec and ignore_spec.match_file(rel):
-        # Excepciones: siempre incluir .gitignore y estructura.txt
-        if rel in ('.gitignore', 'estructura.txt'):
-            return False
+@functools.lru_cache(maxsize=None)
+def compile_exclude(patterns: tuple):
+    """
+    Compila ALWAYS_EXCLUDE + `patterns` (globs) en una función `is_excluded(rel)`.
+    Equivale a `any(fnmatch(rel, pat) for pat in ...)` sobre `os.path.normcase(rel)`,
+    pero separa los patrones según su forma:
+    - literales ('.env', 'build/')       → pertenencia a un frozenset;
+    - literal + '*' final ('build/*')    → `str.startswith` con una tupla de prefijos;
+    - el resto ('*.pem', ...)            → una única regex.
+    """
+    exact, prefixes, globs = set(), [], []
+    for pat in sorted(set(patterns) | ALWAYS_EXCLUDE):
+        pat = os.path.normcase(pat)
+        if not _GLOB_CHARS.intersection(pat):
+            exact.add(pat)
+        elif pat.endswith('*') and not _GLOB_CHARS.intersection(pat[:-1]):
+            prefixes.append(pat[:-1])
+        else:
+            globs.append(pat)
+    exact = frozenset(exact)
+    prefixes = tuple(prefixes)
+    glob_re = re.compile('|'.join(f'(?:{fnmatch.translate(pat)})' for pat in globs)) if globs else None
+
+    def is_excluded(rel: str) -> bool:
+        return (
+            rel in exact
+            or rel.startswith(prefixes)
+            or (glob_re is not None and glob_re.match(rel) is not None)
+        )
+    return is_excluded
+
+
+def should_skip(rel: str, name: str, is_dir: bool, is_excluded, honor_gitignore: bool, ignore_spec: PathSpec):
+    """
+    Decide si `rel` (ruta POSIX relativa al repo) se omite del árbol.
+    Las comprobaciones van de la más barata a la más cara: nombre oculto,
+    patrones precompilados y, al final, PathSpec de .gitignore.
+    """
+    # Ocultos (excepto .gitignore y .github)
+    if name.startswith('.') and name not in VISIBLE_DOTFILES:
         return True
-    # Patrones extra (glob)
-    all_patterns = list(exclude_patterns) + list(ALWAYS_EXCLUDE)
-    if any(fnmatch(rel, pat) for pat in all_patterns):
+    if is_dir:
+        rel += '/'
+    # Patrones extra (glob) + ALWAYS_EXCLUDE, precompilados
+    if is_excluded(os.path.normcase(rel)):
         logging.info(f"Excluyendo por patrón: {rel}")
         return True
-    # Ocultos (excepto .gitignore y .github)
-    if path.name.startswith('.') and path.name not in {'.gitignore', '.github'}:
-        return True
+    # .gitignore (excepciones: siempre incluir .gitignore y estructura.txt)
+    if honor_gitignore and ignore_spec and ignore_spec.match_file(rel):
+        return rel not in ('.gitignore', 'estructura.txt')
     return False
 
 
 def ascii_tree(root: Path, repo_root: Path, prefix='', args=None, ignore_spec=None):
     """Construye lista de líneas con árbol ASCII filtrado"""
-    exclude_patterns = getattr(args, 'exclude', []) or []
+    return list(iter_ascii_tree(root, repo_root, prefix, args, ignore_spec))
+
+
+def iter_ascii_tree(root: Path, repo_root: Path, prefix='', args=None, ignore_spec=None):
+    """Igual que `ascii_tree`, pero genera las líneas una a una sin acumularlas."""
+    # Patrones resueltos una sola vez; el recorrido recibe los valores ya preparados
+    is_excluded = compile_exclude(tuple(getattr(args, 'exclude', []) or []))
     honor_gitignore = getattr(args, 'honor_gitignore', False)
+    return _ascii_tree(root, repo_root, prefix, is_excluded, honor_gitignore, ignore_spec)
 
-    lines = []
+
+def _scan_dir(path: str, rel_base: str, is_excluded, honor_gitignore, ignore_spec):
+    """
+    Lista `path` con os.scandir y devuelve tuplas (nombre, ruta, rel, descender)
+    ya filtradas, en orden inverso para consumirlas con pop().
+    El tipo de cada entrada sale del DirEntry, sin un stat adicional.
+    """
+    kept = []
     try:
-        entries = sorted(root.iterdir(), key=lambda p: p.name.lower())
+        with os.scandir(path) as it:
+            entries = list(it)
     except PermissionError:
-        logging.warning(f"Permiso denegado: {root}")
-        return lines
+        logging.warning(f"Permiso denegado: {path}")
+        return kept
+
+    for entry in entries:
+        try:
+            is_dir = entry.is_dir()
+            descend = is_dir and not entry.is_symlink()
+        except OSError:
+            is_dir = descend = False
+        rel = rel_base + entry.name
+        if should_skip(rel, entry.name, is_dir, is_excluded, honor_gitignore, ignore_spec):
+            continue
+        kept.append((entry.name, entry.path, rel, descend))
+    # Se ordena después de filtrar: solo las entradas visibles pagan la clave
+    kept.sort(key=lambda t: t[0].casefold())
+    kept.reverse()
+    return kept
 
-    entries = [
-        e for e in entries
-        if not should_skip(e, repo_root, exclude_patterns, honor_gitignore, ignore_spec)
-    ]
 
-    for idx, entry in enumerate(entries):
-        connector = '└── ' if idx == len(entries) - 1 else '├── '
-        lines.append(f"{prefix}{connector}{entry.name}")
-        if entry.is_dir() and not entry.is_symlink():
-            extension = '    ' if idx == len(entries) - 1 else '│   '
-            lines += ascii_tree(entry, repo_root, prefix + extension, args, ignore_spec)
-    return lines
+def _ascii_tree(root: Path, repo_root: Path, prefix, is_excluded, honor_gitignore, ignore_spec):
+    rel_root = root.relative_to(repo_root).as_posix()
+    rel_base = '' if rel_root == '.' else rel_root + '/'
+    # Pila explícita de (entradas pendientes del nivel, prefijo) en lugar de recursión
+    stack = [(_scan_dir(str(root), rel_base, is_excluded, honor_gitignore, ignore_spec), prefix)]
+    while stack:
+        pending, prefix = stack[-1]
+        if not pending:
+            stack.pop()
+            continue
+        name, path, rel, descend = pending.pop()
+        last = not pending
+        yield f"{prefix}{'└── ' if last else '├── '}{name}"
+        if descend:
+            extension = '    ' if last else '│   '
+            children = _scan_dir(path, rel + '/', is_excluded, honor_gitignore, ignore_spec)
+            stack.append((children, prefix + extension))
 
 
 def write_atomic(path: Path, lines):
-    """Escribe de forma atómica reemplazando el archivo destino."""
+    """
+    Escribe de forma atómica reemplazando el archivo destino.
+    `lines` puede ser cualquier iterable (p.ej. `iter_ascii_tree`): se escribe
+    línea a línea sobre un buffer de 1 MB, sin unir todo en memoria.
+    """
+    # El temporal vive junto al destino (replace atómico) y con nombre oculto:
+    # si `lines` recorre ese mismo directorio, should_skip lo descarta
     tmp = tempfile.NamedTemporaryFile(
         'w',
+        buffering=WRITE_BUFFER_SIZE,
         delete=False,
         encoding='utf-8',
-        dir=path.parent
+        dir=path.parent,
+        prefix=f'.{path.name}.',
+        suffix='.tmp'
     )
-    with tmp:
-        tmp.write('\n'.join(lines))
-    Path(tmp.name).replace(path)
+    try:
+        with tmp:
+            for i, line in enumerate(lines):
+                if i:
+                    tmp.write('\n')
+                tmp.write(line)
+        Path(tmp.name).replace(path)
+    except BaseException:
+        # El recorrido es perezoso y corre dentro del `with`: si falla (o Ctrl-C)
+        # no debe quedar el temporal oculto en el directorio destino
+        os.unlink(tmp.name)
+        raise
     logging.info(f"Estructura escrita en {path}")
 
 
@@ -169,7 +252,7 @@ def main():
         args.exclude.extend(extra)
 
     logging.info(f"Generando estructura desde {repo_root}")
-    lines = ascii_tree(
+    lines = iter_ascii_tree(
         repo_root, repo_root, prefix='',
         args=args, ignore_spec=ignore_spec
     )
@@ -7,12 +7,12 @@ Este script recorre los archivos del repositorio y genera archivos JSON (tiddler
 Mejoras:
 - Ignora patrones de .gitignore (salvo `estructura.txt` y `.gitignore`).
 - Exporta solo archivos con extensiones válidas o nombres especiales, incluyendo `.toml`.
-- Detecta cambios usando hashes para exportar solo archivos modificados.
+- Detecta cambios usando hashes (y mtime/tamaño para no releer archivos intactos) para exportar solo archivos modificados.
 - Añade tags semánticos con `tag_mapper_UNIX.get_tags_for_file`:
   * Tag de tipo con emoji ⚙️ (p.ej. ⚙️ Python).
   * Tag basado en nombre `-ruta_con_underscores` sin emoji.
   * Tag de grupo `--- Codigo`.
-- Genera bloque Markdown con syntax highlighting adecuado desde `tag_mapper_UNIX.detect_language`.
+- Genera bloque Markdown con syntax highlighting adecuado (`detect_language`).
 - Soporta `--dry-run` para simulación.
 
 Uso:
@@ -24,14 +24,26 @@ import re
 import gzip
 import json
 import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 import argparse
 import tag_mapper_UNIX
-from tag_mapper_UNIX import load_ignore_spec, detect_language
-from rep_export_LINUXandMAC.cli_utils_UNIX import safe_print
+from rep_export_LINUXandMAC.cli_utils_UNIX import safe_print_lines, load_ignore_spec
 from detect_root import find_repo_root
 
+# orjson es opcional: serializa más rápido y devuelve bytes UTF-8 directamente
+try:
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None  # type: ignore
+
+# xxhash es opcional: hash no criptográfico muy rápido, suficiente para detectar cambios
+try:
+    import xxhash  # type: ignore
+except ImportError:
+    xxhash = None  # type: ignore
+
 # ===== Configuración =====
 ROOT_DIR = find_repo_root(Path(__file__))
 SCRIPT_DIR = Path(__file__).parent
@@ -39,64 +51,237 @@ OUTPUT_DIR = SCRIPT_DIR / "tiddlers-export"
 HASH_FILE = SCRIPT_DIR / ".hashes.json"
 IGNORE_SPEC = load_ignore_spec(ROOT_DIR)
 
-VALID_EXT = set(tag_mapper_UNIX.EXTENSION_TAG_MAP.keys()) | {'.toml'}
-ALLOWED_NAMES = set(tag_mapper_UNIX.SPECIAL_FILENAMES.keys())
+VALID_EXT = frozenset(tag_mapper_UNIX.EXTENSION_TAG_MAP) | {'.toml'}
+ALLOWED_NAMES = frozenset(tag_mapper_UNIX.SPECIAL_FILENAMES)
+# Se exportan siempre (si están en la raíz), aunque .gitignore o el filtro de extensión digan lo contrario
+ALWAYS_INCLUDE = frozenset({'estructura.txt', '.gitignore'})
 # Límite de tamaño de archivo para evitar cargar binarios enormes en memoria
 MAX_FILE_SIZE_BYTES = int(os.environ.get('REPO_EXPORT_MAX_FILE_SIZE', 1 * 1024 * 1024))  # default 1 MB
 PREVIEW_BYTES = 65536  # 64 KB
+# Directorios que nunca se recorren: export/data propios, metadatos de VCS,
+# entornos virtuales y cachés (se podan sin consultar el .gitignore)
+SKIP_DIRS = frozenset({
+    'tiddlers-export', 'tiddler_tag_doc', '.git', '__pycache__', 'node_modules',
+    '.venv', 'venv', '.mypy_cache', '.pytest_cache',
+})
+# Hilos que procesan archivos en paralelo (hash, lectura y escritura liberan el GIL)
+EXPORT_WORKERS = int(os.environ.get('REPO_EXPORT_WORKERS', min(32, (os.cpu_count() or 1) * 2)))
+
+def is_dir_ignored(rel_dir: str) -> bool:
+    """True si el directorio `rel_dir` (POSIX, con '/' final) está excluido por .gitignore."""
+    return bool(IGNORE_SPEC) and IGNORE_SPEC.match_file(rel_dir)
+
+
+def _walk(root: str):
+    """
+    Recorre `root` con os.scandir usando una pila explícita.
+    Genera (ruta, rel, nombre, stat) por cada archivo, con `rel` relativo a
+    `root` en formato POSIX. El stat sale del DirEntry, así que el llamador no
+    necesita otra llamada a `stat()` ni calcular rutas relativas.
+    No desciende en los directorios de export/data, en los excluidos por
+    .gitignore ni sigue symlinks a directorios.
+    """
+    stack = [(root, '')]
+    while stack:
+        dirpath, rel_dir = stack.pop()
+        try:
+            it = os.scandir(dirpath)
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                try:
+                    if entry.is_dir():
+                        if entry.name in SKIP_DIRS or entry.is_symlink():
+                            continue
+                        # Barra final: los patrones de directorio (`build/`) solo casan así
+                        rel = f"{rel_dir}{entry.name}/"
+                        if not is_dir_ignored(rel):
+                            stack.append((entry.path, rel))
+                        continue
+                    st = entry.stat()
+                except OSError:
+                    # Symlink roto o permiso denegado
+                    continue
+                yield entry.path, rel_dir + entry.name, entry.name, st
+
 
 def get_all_files():
     """
-    Genera todos los archivos a exportar:
+    Genera tuplas (Path, rel, stat) con todos los archivos a exportar, con
+    `rel` relativo a ROOT_DIR en formato POSIX (sale del recorrido):
     - Siempre incluye 'estructura.txt' y '.gitignore'.
     - Excluye archivos según .gitignore.
     - Filtra por extensiones válidas o nombres especiales.
     """
-    for dirpath, dirnames, filenames in os.walk(ROOT_DIR):
-        # Evitar directorios de export/data
-        dirnames[:] = [d for d in dirnames if d not in ('tiddlers-export', 'tiddler_tag_doc')]
-        for name in filenames:
-            path = Path(dirpath) / name
-            rel = str(path.relative_to(ROOT_DIR))
-            # Siempre incluir estos
-            if rel in ('estructura.txt', '.gitignore'):
-                yield path
-                continue
-            # Skip según .gitignore
-            if IGNORE_SPEC and IGNORE_SPEC.match_file(rel):
-                continue
-            # Extensiones y nombres permitidos
-            if path.suffix.lower() in VALID_EXT or name in ALLOWED_NAMES:
-                yield path
+    for path_str, rel, name, st in _walk(str(ROOT_DIR)):
+        # Filtro barato sobre el nombre antes de construir el Path; splitext
+        # coincide con Path.suffix (un dotfile como '.gitignore' no tiene sufijo)
+        allowed = os.path.splitext(name)[1].lower() in VALID_EXT or name in ALLOWED_NAMES
+        if not (allowed or name in ALWAYS_INCLUDE):
+            continue
+        # Siempre incluir estos
+        if rel in ALWAYS_INCLUDE:
+            yield Path(path_str), rel, st
+            continue
+        # Skip según .gitignore; extensiones y nombres permitidos
+        if allowed and not (IGNORE_SPEC and IGNORE_SPEC.match_file(rel)):
+            yield Path(path_str), rel, st
+
+
+def write_bytes(path: Path, data: bytes, fsync: bool = False) -> None:
+    """
+    Escribe `data` completo con os.open/os.write, sin la capa de buffer de Python.
+    El payload ya está en memoria, así que normalmente basta una sola llamada a write.
+    Con `fsync` se fuerza a disco antes de cerrar.
+    """
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+    fd = os.open(path, flags, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+        if fsync:
+            os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def replace_bytes(path: Path, data: bytes) -> None:
+    """
+    Reemplaza `path` de forma atómica: escribe a un temporal, lo fuerza a disco
+    y lo renombra encima. Si la ejecución se corta, el archivo previo sigue intacto.
+    """
+    tmp = path.with_name(path.name + '.tmp')
+    write_bytes(tmp, data, fsync=True)
+    os.replace(tmp, path)
+
+
+def write_if_changed(path: Path, data: bytes) -> bool:
+    """
+    Escribe `data` solo si difiere del archivo existente; devuelve si se escribió.
+    Solo se lee el archivo previo cuando su tamaño coincide, así que un cambio
+    evidente no añade más que un stat.
+    """
+    try:
+        if os.stat(path).st_size == len(data) and path.read_bytes() == data:
+            return False
+    except OSError:
+        pass
+    write_bytes(path, data)
+    return True
+
+
+def dumps_json(obj) -> bytes:
+    """
+    Serializa a JSON compacto en UTF-8 (tiddlers y `.hashes.json` no necesitan sangría).
+    Usa orjson si está instalado; si no, json con separadores mínimos.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def loads_json(data: bytes):
+    """Inverso de `dumps_json`: decodifica JSON desde bytes UTF-8."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# NOTE: se evaluó compilar con Numba (@njit) hash_bytes/calc_hash, detect_language
+# e infer_relations y se descartó: no hay bucles numéricos sobre arrays, el hash ya
+# se ejecuta en C (hashlib/xxhash) y la importación + JIT de Numba cuesta segundos
+# por ejecución, más que todo el trabajo de Python que podría ahorrar. Las mejoras
+# están en la E/S (scandir, caché mtime/tamaño, una sola lectura) y en las librerías.
+def hash_bytes(data: bytes) -> str:
+    """Hash de cambios: 'xxh64:<hex>' si xxhash está instalado, si no SHA-1 en hexadecimal."""
+    if xxhash is not None:
+        return 'xxh64:' + xxhash.xxh64(data).hexdigest()
+    return hashlib.sha1(data).hexdigest()
+
 
 def calc_hash(content: str) -> str:
+    """SHA-1 del texto en UTF-8: el campo `hash` del tiddler, igual con o sin xxhash."""
     return hashlib.sha1(content.encode('utf-8')).hexdigest()
 
 
+def decode_text(data: bytes) -> str:
+    """Decodifica como `read_text(encoding='utf-8', errors='replace')`, incluidos los saltos de línea universales."""
+    return data.decode('utf-8', errors='replace').replace('\r\n', '\n').replace('\r', '\n')
+
+
 def hash_file_streaming(path: Path) -> str:
-    """Calcula SHA-1 en bloques de 64 KB sin cargar el archivo completo en memoria."""
-    h = hashlib.sha1()
+    """Calcula el hash de `hash_bytes` en bloques de 64 KB sin cargar el archivo completo en memoria."""
     with open(path, 'rb') as f:
+        if xxhash is not None:
+            h = xxhash.xxh64()
+            for chunk in iter(lambda: f.read(65536), b''):
+                h.update(chunk)
+            return 'xxh64:' + h.hexdigest()
+        if hasattr(hashlib, 'file_digest'):
+            # Python 3.11+: bucle readinto en C con buffer reutilizable
+            return hashlib.file_digest(f, 'sha1').hexdigest()
+        h = hashlib.sha1()
         for chunk in iter(lambda: f.read(65536), b''):
             h.update(chunk)
     return h.hexdigest()
 
 
-def safe_title(path: Path) -> str:
+def cached_entry(st, prev, trusted_before_ns: int = 0):
+    """
+    Devuelve la entrada previa de `.hashes.json` si mtime y tamaño la validan
+    (el archivo no se abre); si no, None.
+    `trusted_before_ns` es el mtime del `.hashes.json` previo: un archivo con
+    mtime igual o posterior pudo cambiar dentro del mismo tick de reloj en que
+    se hasheó ("racily clean", como en git), así que no se da por válido.
+    """
+    if (isinstance(prev, dict) and prev.get('mtime') == st.st_mtime_ns
+            and prev.get('size') == st.st_size and st.st_mtime_ns < trusted_before_ns):
+        return prev
+    return None
+
+
+def new_entry(h: str, st, prev):
+    """
+    Devuelve (entrada, cambiado) para un hash recién calculado.
+    Acepta entradas previas antiguas que solo guardaban el hash como cadena.
+    """
+    prev_hash = prev.get('hash') if isinstance(prev, dict) else prev
+    return {'hash': h, 'mtime': st.st_mtime_ns, 'size': st.st_size}, prev_hash != h
+
+
+def hash_entry(file: Path, st, prev, trusted_before_ns: int = 0):
+    """
+    Devuelve (entrada, cambiado) para `.hashes.json`, hasheando el archivo en
+    streaming solo si `cached_entry` no permite reutilizar la entrada previa.
+    """
+    entry = cached_entry(st, prev, trusted_before_ns)
+    if entry is not None:
+        return entry, False
+    return new_entry(hash_file_streaming(file), st, prev)
+
+
+def safe_title(path: Path, rel: str = None) -> str:
     """
     Retorna la ruta relativa natural como display title para TiddlyWiki (separador '/').
     Ejemplo: 'rep_export_LINUXandMAC/tiddler_exporter_UNIX.py'
+    Si se pasa `rel` (ruta relativa POSIX del recorrido) se usa tal cual.
     """
+    if rel is not None:
+        return rel
     return path.relative_to(ROOT_DIR).as_posix()
 
 
-def sanitize_filename(path: Path) -> str:
+def sanitize_filename(path: Path, rel: str = None) -> str:
     """
     Genera un nombre de archivo seguro para disco.
     Solo permite: letras, dígitos, puntos, guiones y guiones bajos.
     Trunca en 200 caracteres añadiendo sufijo de hash para evitar colisiones.
+    `rel` es la ruta relativa POSIX si ya se conoce (evita `relative_to`).
     """
-    rel = path.relative_to(ROOT_DIR).as_posix()
+    if rel is None:
+        rel = path.relative_to(ROOT_DIR).as_posix()
     safe = re.sub(r'[^a-zA-Z0-9._-]', '_', rel.replace('/', '_'))
     safe = safe.lstrip('.-_')
     if not safe:
@@ -108,39 +293,44 @@ def sanitize_filename(path: Path) -> str:
 
 def detect_language(path: Path) -> str:
     """Detecta lenguaje para syntax highlighting."""
-    ext = path.suffix.lower().lstrip('.')
-    return tag_mapper_UNIX.EXTENSION_TAG_MAP.get(path.suffix.lower(), ext)
+    suffix = path.suffix.lower()
+    return tag_mapper_UNIX.EXTENSION_TAG_MAP.get(suffix, suffix.lstrip('.'))
 
 
-def build_large_tiddler(file: Path, action: str = 'preview', preview_bytes: int = PREVIEW_BYTES) -> dict:
+def build_large_tiddler(file: Path, action: str = 'preview', preview_bytes: int = PREVIEW_BYTES,
+                        size_bytes: int = None, rel: str = None) -> dict:
     """
     Crea un tiddler para archivos grandes sin leer todo su contenido.
     action: 'preview' | 'copy' | 'embed'
+    size_bytes: tamaño ya conocido (stat del recorrido); si falta se consulta.
+    rel: ruta relativa POSIX ya conocida (del recorrido); si falta se calcula.
     """
-    title = safe_title(file)
+    title = safe_title(file, rel)
     tags_semantic = tag_mapper_UNIX.get_tags_for_file(file)
-    rel_path = str(file.relative_to(ROOT_DIR))
-    size_bytes = file.stat().st_size
+    rel_path = rel.replace('/', os.sep) if rel is not None else str(file.relative_to(ROOT_DIR))
+    if size_bytes is None:
+        size_bytes = file.stat().st_size
 
+    # Una lectura binaria de la cabecera sirve para detectar binarios y para la vista previa
     raw_head = b''
     try:
         with open(file, 'rb') as f:
-            raw_head = f.read(4096)
+            raw_head = f.read(max(4096, preview_bytes) if action == 'preview' else 4096)
     except OSError:
         pass
-    is_binary = b'\x00' in raw_head
+    is_binary = b'\x00' in raw_head[:4096]
 
     if action == 'embed':
         try:
-            content = file.read_text(encoding='utf-8', errors='replace')
-        except Exception:
+            content = decode_text(file.read_bytes())
+        except OSError:
             content = ''
         lang = detect_language(file)
         text = f'```{lang}\n{content}\n```'
     elif action == 'copy':
         large_dir = OUTPUT_DIR / 'large'
         large_dir.mkdir(parents=True, exist_ok=True)
-        gz_name = sanitize_filename(file) + '.gz'
+        gz_name = sanitize_filename(file, rel) + '.gz'
         gz_path = large_dir / gz_name
         try:
             with open(file, 'rb') as f_in, gzip.open(gz_path, 'wb') as f_out:
@@ -191,6 +381,7 @@ def export_tiddlers(
     large_action: str = 'preview',
     preview_bytes: int = PREVIEW_BYTES,
     max_size: int = None,
+    workers: int = None,
 ):
     """
     Exporta tiddlers JSON para archivos modificados.
@@ -199,72 +390,97 @@ def export_tiddlers(
     OUTPUT_DIR.mkdir(exist_ok=True)
     # Carga hashes previos
     old_hashes = {}
-    if HASH_FILE.exists():
-        try:
-            old_hashes = json.loads(HASH_FILE.read_text(encoding='utf-8'))
-        except Exception:
-            old_hashes = {}
+    hashes_mtime_ns = 0
+    # Sin exists() previo: en la primera ejecución basta el open fallido, y el
+    # fstat del mismo descriptor da el mtime exacto del contenido leído
+    try:
+        with open(HASH_FILE, 'rb') as f:
+            hashes_mtime_ns = os.fstat(f.fileno()).st_mtime_ns
+            old_hashes = loads_json(f.read())
+    except FileNotFoundError:
+        pass
+    except Exception:
+        old_hashes = {}
     new_hashes = {}
     changed = []
+    # Mensajes acumulados; se imprimen de una vez al final
+    log = []
+    # Un único sello de tiempo por ejecución para created/modified
+    now_str = datetime.now(timezone.utc).strftime('%Y%m%d%H%M%S%f')[:17]
 
-    for file in get_all_files():
-        rel = str(file.relative_to(ROOT_DIR))
-        if file.stat().st_size > effective_max:
+    def process(item):
+        """
+        Trabajo completo de un archivo: hash, lectura, tiddler, JSON y escritura.
+        Devuelve (rel, entrada de hash | None, mensaje | None, cambiado).
+        """
+        file, rel_posix, st = item
+        # Clave de `.hashes.json` con el separador nativo, como siempre
+        rel = rel_posix.replace('/', os.sep)
+        if st.st_size > effective_max:
             if not include_large:
-                safe_print(f"[skip] '{rel}' supera el limite de {effective_max // 1024} KB.")
-                continue
-            h = hash_file_streaming(file)
-            new_hashes[rel] = h
-            if old_hashes.get(rel) == h:
-                continue
-            tiddler = build_large_tiddler(file, action=large_action, preview_bytes=preview_bytes)
-            out = OUTPUT_DIR / f"{sanitize_filename(file)}.json"
+                return rel, None, f"[skip] '{rel}' supera el limite de {effective_max // 1024} KB.", False
+            entry, modified = hash_entry(file, st, old_hashes.get(rel), hashes_mtime_ns)
+            if not modified:
+                return rel, entry, None, False
+            tiddler = build_large_tiddler(file, action=large_action, preview_bytes=preview_bytes,
+                                          size_bytes=st.st_size, rel=rel_posix)
+            out = OUTPUT_DIR / f"{sanitize_filename(file, rel_posix)}.json"
             if dry_run:
-                safe_print(f"[dry-run large] {rel}")
-            else:
-                out.write_text(json.dumps(tiddler, ensure_ascii=False, indent=2), encoding='utf-8')
-                safe_print(f"Exported [large/{large_action}]: {rel}")
-            changed.append(rel)
-            continue
-        h = hash_file_streaming(file)
-        new_hashes[rel] = h
-        if old_hashes.get(rel) == h:
-            continue
+                return rel, entry, f"[dry-run large] {rel}", True
+            # La vista previa no incluye el hash: un cambio fuera de ella no reescribe el tiddler
+            write_if_changed(out, dumps_json(tiddler))
+            return rel, entry, f"Exported [large/{large_action}]: {rel}", True
+        prev = old_hashes.get(rel)
+        entry = cached_entry(st, prev, hashes_mtime_ns)
+        if entry is not None:
+            return rel, entry, None, False
+        # Una sola lectura por archivo: los mismos bytes dan el hash y el contenido
         try:
-            content = file.read_text(encoding='utf-8', errors='replace')
-        except Exception:
-            continue
-        title = safe_title(file)
+            data = file.read_bytes()
+        except OSError:
+            return rel, None, None, False
+        entry, modified = new_entry(hash_bytes(data), st, prev)
+        if not modified:
+            return rel, entry, None, False
+        content = decode_text(data)
+        title = safe_title(file, rel_posix)
         tags = tag_mapper_UNIX.get_tags_for_file(file)
         lang = detect_language(file)
-        text_md = (
-            "## [[Tags]]\n"
-            f"{' '.join(tags)}\n\n"
-            f"```{lang}\n{content}\n```"
-        )
+        tags_joined = ' '.join(tags)
+        text_md = '\n'.join(("## [[Tags]]", tags_joined, "", f"```{lang}", content, "```"))
         tiddler = {
             'title': title,
             'text': text_md,
-            'tags': ' '.join(tags),
+            'tags': tags_joined,
             'type': 'text/markdown',
-            'created': datetime.now(timezone.utc).strftime('%Y%m%d%H%M%S%f')[:17],
-            'modified': datetime.now(timezone.utc).strftime('%Y%m%d%H%M%S%f')[:17]
+            'created': now_str,
+            'modified': now_str
         }
-        out = OUTPUT_DIR / f"{sanitize_filename(file)}.json"
+        out = OUTPUT_DIR / f"{sanitize_filename(file, rel_posix)}.json"
         if dry_run:
-            safe_print(f"[dry-run] {rel}")
-        else:
-            out.write_text(json.dumps(tiddler, ensure_ascii=False, indent=2), encoding='utf-8')
-            safe_print(f"Exported: {rel}")
-        changed.append(rel)
+            return rel, entry, f"[dry-run] {rel}", True
+        write_bytes(out, dumps_json(tiddler))
+        return rel, entry, f"Exported: {rel}", True
+
+    # Hash, lectura y escritura sueltan el GIL: los archivos se procesan en paralelo.
+    # map conserva el orden, así que el log y la lista de cambios son deterministas;
+    # cualquier error de un hilo se propaga aquí.
+    with ThreadPoolExecutor(max_workers=max(1, workers or EXPORT_WORKERS)) as pool:
+        for rel, entry, msg, was_changed in pool.map(process, get_all_files()):
+            if entry is not None:
+                new_hashes[rel] = entry
+            if msg:
+                log.append(msg)
+            if was_changed:
+                changed.append(rel)
 
     if not dry_run:
-        HASH_FILE.write_text(json.dumps(new_hashes, indent=2), encoding='utf-8')
+        replace_bytes(HASH_FILE, dumps_json(new_hashes))
 
     # Reporte final
-    safe_print(f"\nTotal cambios: {len(changed)}")
-    for c in changed:
-        safe_print(f"  - {c}")
+    log.append(f"\nTotal cambios: {len(changed)}")
+    log.extend(f"  - {c}" for c in changed)
+    safe_print_lines(log)
 if __name__ == '__main__':
     _p = argparse.ArgumentParser(description="Exporta tiddlers JSON del repositorio.")
     _p.add_argument('--dry-run', action='store_true', help="Simular sin escribir archivos.")
@@ -276,6 +492,8 @@ if __name__ == '__main__':
                     help=f"Bytes a incluir en el preview (default {PREVIEW_BYTES}).")
     _p.add_argument('--max-size', type=int, default=None,
                     help="Límite de tamaño en bytes. Sobreescribe MAX_FILE_SIZE_BYTES.")
+    _p.add_argument('--workers', type=int, default=None,
+                    help=f"Hilos para procesar archivos (default {EXPORT_WORKERS}; 1 = secuencial).")
     _p.add_argument('--root', type=Path, default=None,
                     help="Raíz del repositorio objetivo. Sobreescribe detección automática.")
     _args = _p.parse_args()
@@ -288,4 +506,5 @@ if __name__ == '__main__':
         large_action=_args.large_action,
         preview_bytes=_args.preview_bytes,
         max_size=_args.max_size,
+        workers=_args.workers,
     )
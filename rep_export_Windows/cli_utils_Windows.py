@@ -9,16 +9,27 @@ Utilidades comunes para scripts CLI:
 - `get_additional_args` → Parsear argumentos libres del usuario.
 - `confirm_overwrite`   → Confirmar sobreescritura de archivos existentes.
 - `safe_print`     → Imprime mensajes evitando errores de codificación (emojis).
+- `safe_print_lines` → Igual que `safe_print` para varias líneas en una sola escritura.
 - `load_ignore_spec` → Carga y compila patrones de `.gitignore`.
 - `is_ignored`     → Verifica si una ruta debe ser ignorada según `.gitignore`.
 """
+import codecs
+import io
+import locale
+import os
+import stat
 import subprocess
 import sys
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Tuple, Optional
+from typing import Iterable, List, Tuple, Optional
 from pathspec import PathSpec
 
 
+# Tamaño máximo de cada lectura de la salida de un subproceso en `run_cmd`
+READ_CHUNK_SIZE = 65536
+
+
 def safe_print(message: str) -> None:
     """Imprime evitando errores de codificación en consolas con encoding limitado."""
     try:
@@ -29,6 +40,13 @@ def safe_print(message: str) -> None:
         print(filtered)
 
 
+def safe_print_lines(lines: Iterable[str]) -> None:
+    """Imprime varias líneas con una sola escritura en consola (ver `safe_print`)."""
+    text = '\n'.join(lines)
+    if text:
+        safe_print(text)
+
+
 def prompt_yes_no(question: str, default: bool = False) -> bool:
     """Pregunta interactiva sí/no con valor por defecto."""
     default_str = 'S/n' if default else 's/N'
@@ -58,11 +76,27 @@ def run_cmd(cmd: List[str], cwd: Optional[Path] = None) -> Tuple[int, str, str]:
         cwd=cwd,
         stdout=subprocess.PIPE,
         stderr=subprocess.STDOUT,
-        text=True,
-        bufsize=1
     )
-    for line in process.stdout:
-        print(line, end='')  # Muestra cada línea en tiempo real
+    # os.read devuelve lo que haya en la tubería (hasta 64 KB): salida en vivo
+    # sin una lectura + print por cada línea. El decodificador incremental
+    # reproduce text=True (encoding local, '\r\n' → '\n') aunque un carácter
+    # quede partido entre dos bloques.
+    decoder = io.IncrementalNewlineDecoder(
+        codecs.getincrementaldecoder(locale.getpreferredencoding(False))(errors='replace'),
+        translate=True,
+    )
+    interactive = sys.stdout.isatty()
+    fd = process.stdout.fileno()
+    with process.stdout:
+        while True:
+            chunk = os.read(fd, READ_CHUNK_SIZE)
+            if not chunk:
+                break
+            sys.stdout.write(decoder.decode(chunk))
+            if interactive:
+                sys.stdout.flush()
+        sys.stdout.write(decoder.decode(b'', final=True))
+    sys.stdout.flush()
     process.wait()
     return process.returncode, None, None
 
@@ -84,30 +118,50 @@ def load_ignore_spec(repo_root: Path):
     """
     Carga y compila los patrones de `.gitignore` desde el directorio raíz.
     Devuelve un PathSpec usable para match_file(path).
+    El PathSpec compilado se reutiliza mientras el `.gitignore` no cambie
+    (misma ruta, mtime y tamaño).
     """
     gitignore = repo_root / '.gitignore'
-    if not gitignore.is_file():
+    try:
+        st = gitignore.stat()
+    except OSError:
         return None
-    lines = [
-        ln.strip() for ln in gitignore.read_text(encoding='utf-8').splitlines()
-        if ln.strip() and not ln.strip().startswith('#')
-    ]
+    if not stat.S_ISREG(st.st_mode):
+        return None
+    return _compile_ignore_spec(str(gitignore), st.st_mtime_ns, st.st_size)
+
+
+@lru_cache(maxsize=32)
+def _compile_ignore_spec(gitignore: str, mtime_ns: int, size: int):
+    """Lee y compila `gitignore`; mtime y tamaño solo forman parte de la clave de caché."""
+    with open(gitignore, encoding='utf-8') as f:
+        lines = [
+            ln.strip() for ln in f.read().splitlines()
+            if ln.strip() and not ln.strip().startswith('#')
+        ]
     if not lines:
         return None
     return PathSpec.from_lines('gitwildmatch', lines)
 
 
-def is_ignored(path: Path, ignore_spec):
+def is_ignored(path: Path, ignore_spec, is_dir: Optional[bool] = None, repo_root: Optional[Path] = None):
     """
     Verifica si una ruta debe ser ignorada por `.gitignore`.
-    Path debe ser relativo o absoluto dentro de repo_root.
+    Path debe ser relativo a repo_root (o absoluto dentro de él si se pasa `repo_root`).
+    Los directorios se consultan con '/' final: pathspec solo aplica patrones
+    de directorio (`build/`) a rutas que terminan en '/'.
+    `is_dir` evita consultar el disco (los recorridos ya lo saben por el DirEntry);
+    si falta, se comprueba resolviendo `path` contra `repo_root`, nunca contra el CWD.
     """
     if ignore_spec is None:
         return False
-    rel = str(path)
+    trailing_slash = isinstance(path, str) and path.endswith('/')
+    path = Path(path)
+    if repo_root is not None and path.is_absolute():
+        path = path.relative_to(repo_root)
+    rel = path.as_posix()
+    if is_dir is None:
+        is_dir = trailing_slash or (repo_root is not None and (Path(repo_root) / path).is_dir())
+    if is_dir:
+        rel += '/'
     return ignore_spec.match_file(rel)
-
-
-def alguna_funcion():
-    from tag_mapper_windows import get_tags_for_file
-    # ...usa get_tags_for_file aquí...
@@ -7,10 +7,12 @@ Genera un árbol ASCII del repositorio, respetando .gitignore y
 forzando que siempre se incluyan `.gitignore` y `estructura.txt`.
 """
 import os
+import re
 import sys
 import argparse
 import logging
 import tempfile
+import functools
 from pathlib import Path
 import fnmatch
 from pathspec import PathSpec
@@ -32,76 +34,157 @@ ALWAYS_EXCLUDE = {
     '.mypy_cache/', '.mypy_cache/*', '.git/', '.git/*'
 }
 
+# Archivos/carpetas ocultos que sí se muestran en el árbol
+VISIBLE_DOTFILES = frozenset({'.gitignore', '.github'})
+# Buffer de escritura de estructura.txt (agrupa las líneas en pocas llamadas a write)
+WRITE_BUFFER_SIZE = 1 << 20
 
-def load_gitignore_patterns(repo_root: Path):
-    """Devuelve lista de patrones (glob) extraídos de .gitignore."""
-    gitignore = repo_root / '.gitignore'
-    if not gitignore.is_file():
-        return []
-    lines = [ln.strip() for ln in gitignore.read_text(encoding='utf-8').splitlines()
-             if ln.strip() and not ln.strip().startswith('#')]
-    return lines
 
+# Metacaracteres de fnmatch; un patrón sin ellos es un literal
+_GLOB_CHARS = frozenset('*?[')
 
-def matches_pattern(path: Path, patterns, repo_root: Path):
-    """True si la ruta relativa coincide con algún patrón glob."""
-    rel = str(path.relative_to(repo_root))
-    return any(fnmatch.fnmatch(rel, pat) for pat in patterns)
 
-
-def should_skip(path: Path, repo_root: Path, exclude_patterns, honor_gitignore: bool, ignore_spec: PathSpec):
-    rel = path.relative_to(repo_root).as_posix()
-    if path.is_dir() and not rel.endswith('/'):
-        rel += '/'
-    if honor_gitignore and ignore_spec and ignore_spec.match_file(rel):
+@functools.lru_cache(maxsize=None)
+def compile_exclude(patterns: tuple):
+    """
+    Compila ALWAYS_EXCLUDE + `patterns` (globs) en una función `is_excluded(rel)`.
+    Equivale a `any(fnmatch(rel, pat) for pat in ...)` sobre `os.path.normcase(rel)`,
+    pero separa los patrones según su forma:
+    - literales ('.env', 'build/')       → pertenencia a un frozenset;
+    - literal + '*' final ('build/*')    → `str.startswith` con una tupla de prefijos;
+    - el resto ('*.pem', ...)            → una única regex.
+    """
+    exact, prefixes, globs = set(), [], []
+    for pat in sorted(set(patterns) | ALWAYS_EXCLUDE):
+        pat = os.path.normcase(pat)
+        if not _GLOB_CHARS.intersection(pat):
+            exact.add(pat)
+        elif pat.endswith('*') and not _GLOB_CHARS.intersection(pat[:-1]):
+            prefixes.append(pat[:-1])
+        else:
+            globs.append(pat)
+    exact = frozenset(exact)
+    prefixes = tuple(prefixes)
+    glob_re = re.compile('|'.join(f'(?:{fnmatch.translate(pat)})' for pat in globs)) if globs else None
+
+    def is_excluded(rel: str) -> bool:
+        return (
+            rel in exact
+            or rel.startswith(prefixes)
+            or (glob_re is not None and glob_re.match(rel) is not None)
+        )
+    return is_excluded
+
+
+def should_skip(rel: str, name: str, is_dir: bool, is_excluded, honor_gitignore: bool, ignore_spec: PathSpec):
+    """
+    Decide si `rel` (ruta POSIX relativa al repo) se omite del árbol.
+    Orden de más barata a más cara: nombre oculto, patrones precompilados, .gitignore.
+    """
+    if name.startswith('.') and name not in VISIBLE_DOTFILES:
         return True
-    all_patterns = list(exclude_patterns) + list(ALWAYS_EXCLUDE)
-    if any(fnmatch.fnmatch(rel, pat) for pat in all_patterns):
+    if is_dir:
+        rel += '/'
+    if is_excluded(os.path.normcase(rel)):
         logging.info(f"Excluyendo por patrón: {rel}")
         return True
-    if path.name.startswith('.') and path.name not in {'.gitignore', '.github'}:
+    if honor_gitignore and ignore_spec and ignore_spec.match_file(rel):
         return True
     return False
 
 
 def ascii_tree(root: Path, repo_root: Path, prefix: str = '', args=None, gitignore_patterns=None, gitignore_spec=None):
-    logging.info(f"Entrando a: {root}")
     """
     Construye líneas de árbol ASCII, filtrando según skip logic.
+    Los patrones y el PathSpec se resuelven una sola vez aquí, no en cada nivel.
     """
-    # determinar PathSpec a usar
-    if args and getattr(args, 'honor_gitignore', False):
+    return list(iter_ascii_tree(root, repo_root, prefix, args, gitignore_patterns, gitignore_spec))
+
+
+def iter_ascii_tree(root: Path, repo_root: Path, prefix: str = '', args=None, gitignore_patterns=None, gitignore_spec=None):
+    """Igual que `ascii_tree`, pero genera las líneas una a una sin acumularlas."""
+    honor_gitignore = getattr(args, 'honor_gitignore', False)
+    ignore_spec = gitignore_spec
+    if honor_gitignore and ignore_spec is None:
         ignore_spec = load_ignore_spec(repo_root)
-    else:
-        ignore_spec = gitignore_spec
-    exclude_patterns = getattr(args, 'exclude', []) or []
+    is_excluded = compile_exclude(tuple(getattr(args, 'exclude', []) or []))
+    return _ascii_tree(root, repo_root, prefix, is_excluded, honor_gitignore, ignore_spec)
+
 
-    lines = []
+def _scan_dir(path: str, rel_base: str, is_excluded, honor_gitignore: bool, ignore_spec):
+    """
+    Lista `path` con os.scandir y devuelve tuplas (nombre, ruta, rel, descender)
+    ya filtradas, en orden inverso para consumirlas con pop().
+    El tipo de cada entrada sale del DirEntry, sin un stat adicional.
+    """
+    logging.info(f"Entrando a: {path}")
+    kept = []
     try:
-        entries = sorted(root.iterdir(), key=lambda p: p.name.lower())
+        with os.scandir(path) as it:
+            entries = list(it)
     except PermissionError:
-        logging.warning(f"Permiso denegado: {root}")
-        return lines
+        logging.warning(f"Permiso denegado: {path}")
+        return kept
 
     # filtrar
-    entries = [e for e in entries if not should_skip(e, repo_root, exclude_patterns, getattr(args, 'honor_gitignore', False), ignore_spec)]
-
-    # construir
-    for idx, entry in enumerate(entries):
-        connector = '└── ' if idx == len(entries) - 1 else '├── '
-        lines.append(f"{prefix}{connector}{entry.name}")
-        if entry.is_dir() and not entry.is_symlink():
-            extension = '    ' if idx == len(entries) - 1 else '│   '
-            lines += ascii_tree(entry, repo_root, prefix + extension, args, gitignore_patterns, ignore_spec)
-    return lines
+    for entry in entries:
+        try:
+            is_dir = entry.is_dir()
+            descend = is_dir and not entry.is_symlink()
+        except OSError:
+            is_dir = descend = False
+        rel = rel_base + entry.name
+        if should_skip(rel, entry.name, is_dir, is_excluded, honor_gitignore, ignore_spec):
+            continue
+        kept.append((entry.name, entry.path, rel, descend))
+    # Se ordena después de filtrar: solo las entradas visibles pagan la clave
+    kept.sort(key=lambda t: t[0].casefold())
+    kept.reverse()
+    return kept
+
+
+def _ascii_tree(root: Path, repo_root: Path, prefix: str, is_excluded, honor_gitignore: bool, ignore_spec):
+    rel_root = root.relative_to(repo_root).as_posix()
+    rel_base = '' if rel_root == '.' else rel_root + '/'
+    # Pila explícita de (entradas pendientes del nivel, prefijo) en lugar de recursión
+    stack = [(_scan_dir(str(root), rel_base, is_excluded, honor_gitignore, ignore_spec), prefix)]
+    while stack:
+        pending, prefix = stack[-1]
+        if not pending:
+            stack.pop()
+            continue
+        # construir
+        name, path, rel, descend = pending.pop()
+        last = not pending
+        yield f"{prefix}{'└── ' if last else '├── '}{name}"
+        if descend:
+            extension = '    ' if last else '│   '
+            children = _scan_dir(path, rel + '/', is_excluded, honor_gitignore, ignore_spec)
+            stack.append((children, prefix + extension))
 
 
 def write_atomic(path: Path, lines):
-    """Escribe de forma atómica usando tempfile + replace."""
-    tmp = tempfile.NamedTemporaryFile('w', delete=False, encoding='utf-8', dir=path.parent)
-    with tmp:
-        tmp.write('\n'.join(lines))
-    Path(tmp.name).replace(path)
+    """
+    Escribe de forma atómica usando tempfile + replace.
+    Acepta cualquier iterable de líneas; se escriben una a una sobre un buffer de 1 MB.
+    """
+    # El temporal vive junto al destino (replace atómico) y con nombre oculto:
+    # si `lines` recorre ese mismo directorio, should_skip lo descarta
+    tmp = tempfile.NamedTemporaryFile('w', buffering=WRITE_BUFFER_SIZE, delete=False,
+                                      encoding='utf-8', dir=path.parent,
+                                      prefix=f'.{path.name}.', suffix='.tmp')
+    try:
+        with tmp:
+            for i, line in enumerate(lines):
+                if i:
+                    tmp.write('\n')
+                tmp.write(line)
+        Path(tmp.name).replace(path)
+    except BaseException:
+        # El recorrido es perezoso y corre dentro del `with`: si falla (o Ctrl-C)
+        # no debe quedar el temporal oculto en el directorio destino
+        os.unlink(tmp.name)
+        raise
     logging.info(f"Estructura escrita en {path}")
 
 
@@ -126,12 +209,13 @@ def main():
     os.chdir(repo_root)
     if args.exclude_from and args.exclude_from.is_file():
         args.exclude += [ln.strip() for ln in args.exclude_from.read_text(encoding='utf-8').splitlines() if ln.strip() and not ln.strip().startswith('#')]
+    ignore_spec = load_ignore_spec(repo_root) if args.honor_gitignore else None
     logging.info(f"Generando estructura desde {repo_root}")
-    lines = ascii_tree(repo_root, repo_root, prefix='', args=args)
     output_path = repo_root / args.output
     if output_path.exists() and not (args.force or confirm_overwrite(output_path)):
         print("Operación cancelada por el usuario.")
         return
+    lines = iter_ascii_tree(repo_root, repo_root, prefix='', args=args, gitignore_spec=ignore_spec)
     write_atomic(output_path, lines)
 
 if __name__ == '__main__':
@@ -21,8 +21,8 @@ from pathlib import Path
 from typing import List, Tuple
 
 # Directorios a ignorar al escanear (igual que los exporters)
-_SKIP_DIRS = {'tiddlers-export', 'tiddler_tag_doc', '.git', '__pycache__',
-              'node_modules', '.venv', 'venv', 'dist', 'build'}
+_SKIP_DIRS = frozenset({'tiddlers-export', 'tiddler_tag_doc', '.git', '__pycache__',
+                        'node_modules', '.venv', 'venv', 'dist', 'build'})
 
 
 @dataclass
@@ -67,18 +67,28 @@ def scan_large_files(root: Path, max_bytes: int = 1 * 1024 * 1024) -> ScanResult
     sizes: List[int] = []
     large: List[Tuple[Path, int]] = []
 
-    for dirpath, dirnames, filenames in os.walk(root):
-        # Filtrar directorios ignorados in-place para no descender
-        dirnames[:] = [d for d in dirnames if d not in _SKIP_DIRS]
-        for name in filenames:
-            path = Path(dirpath) / name
-            try:
-                size = path.stat().st_size
-            except OSError:
-                continue
-            sizes.append(size)
-            if size > max_bytes:
-                large.append((path, size))
+    # os.scandir con pila explícita: el tamaño sale del DirEntry (en Windows
+    # sin syscall extra) y solo se construye un Path para los archivos grandes
+    stack = [str(root)]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                try:
+                    if entry.is_dir():
+                        # Igual que os.walk: no sigue symlinks a directorios
+                        if entry.name not in _SKIP_DIRS and not entry.is_symlink():
+                            stack.append(entry.path)
+                        continue
+                    size = entry.stat().st_size
+                except OSError:
+                    continue
+                sizes.append(size)
+                if size > max_bytes:
+                    large.append((Path(entry.path), size))
 
     if not sizes:
         return ScanResult()
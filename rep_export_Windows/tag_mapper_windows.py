@@ -19,9 +19,9 @@ List[str] con tags en sintaxis TiddlyWiki (`[[TagName]]`).
 """
 import json
 import os
+import threading
 from pathlib import Path
-from typing import List, Dict, Any
-from cli_utils_Windows import load_ignore_spec, is_ignored
+from typing import List, Dict, Any, Optional
 
 # Intentar importar pathspec para respetar .gitignore
 try:
@@ -33,21 +33,37 @@ except ImportError:
 # Rutas y carga de JSON personalizados
 # ========================================
 TIDDLER_TAG_DIR = Path(__file__).resolve().parent / "tiddler_tag_doc"
-
-# Mapa de título a tags personalizados
-title_to_tags: Dict[str, List[str]] = {}
-if TIDDLER_TAG_DIR.is_dir():
-    for json_file in sorted(TIDDLER_TAG_DIR.glob("*.json")):
-        try:
-            data = json.loads(json_file.read_text(encoding="utf-8"))
-            if isinstance(data, list):
-                for item in data:
-                    title = item.get("title", "").strip()
-                    tags_str = item.get("tags", "").strip()
-                    if title and tags_str:
-                        title_to_tags[title] = tags_str.split()
-        except Exception as e:
-            print(f"⚠️ Error leyendo {json_file.name}: {e}")
+# Raíz contra la que se calculan los títulos (resuelta una vez, no por archivo)
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+
+# Mapa de título a tags personalizados (se carga en el primer uso)
+_title_to_tags: Optional[Dict[str, List[str]]] = None
+_title_map_lock = threading.Lock()
+
+
+def _get_title_map() -> Dict[str, List[str]]:
+    """Carga una sola vez los tags personalizados de `tiddler_tag_doc/`."""
+    global _title_to_tags
+    if _title_to_tags is None:
+        # get_tags_for_file se llama desde los hilos de export: sin el lock
+        # cada hilo releería y avisaría de los mismos JSON
+        with _title_map_lock:
+            if _title_to_tags is None:
+                title_map: Dict[str, List[str]] = {}
+                if TIDDLER_TAG_DIR.is_dir():
+                    for json_file in sorted(TIDDLER_TAG_DIR.glob("*.json")):
+                        try:
+                            data = json.loads(json_file.read_text(encoding="utf-8"))
+                            if isinstance(data, list):
+                                for item in data:
+                                    title = item.get("title", "").strip()
+                                    tags_str = item.get("tags", "").strip()
+                                    if title and tags_str:
+                                        title_map[title] = tags_str.split()
+                        except Exception as e:
+                            print(f"⚠️ Error leyendo {json_file.name}: {e}")
+                _title_to_tags = title_map
+    return _title_to_tags
 
 # ========================================
 # Mapeo extensión → Tag
@@ -73,6 +89,12 @@ SPECIAL_FILENAMES: Dict[str, str] = {
 
 DEFAULT_TAG = "--- 🧬 Por Clasificar"
 
+# Tags de tipo ya formateados; nombres especiales y extensiones por separado
+# para que un nombre (p.ej. '.gitignore') nunca responda a una extensión
+_NAME_TYPE_TAGS: Dict[str, str] = {name: f"[[⚙️ {base}]]" for name, base in SPECIAL_FILENAMES.items()}
+_EXT_TYPE_TAGS: Dict[str, str] = {ext: f"[[⚙️ {base}]]" for ext, base in EXTENSION_TAG_MAP.items()}
+_DEFAULT_TYPE_TAG = f"[[{DEFAULT_TAG}]]"
+
 # ========================================
 # Función para interpretar .gitignore
 # ========================================
@@ -115,39 +137,31 @@ SPECIAL_HIGHLIGHT: Dict[str, str] = {
 
 def detect_language(file_path: Path) -> str:
     """Devuelve la etiqueta de lenguaje para bloques Markdown."""
-    name = file_path.name
-    if name in SPECIAL_HIGHLIGHT:
-        return SPECIAL_HIGHLIGHT[name]
-    return HIGHLIGHT_MAP.get(file_path.suffix.lower(), 'text')
+    # Nombre especial primero y luego extensión, cada uno en su propio mapa:
+    # '.gitignore' es un nombre, no una extensión ('x.gitignore' no es gitignore)
+    return SPECIAL_HIGHLIGHT.get(file_path.name) or HIGHLIGHT_MAP.get(file_path.suffix.lower(), 'text')
+
 
+def _type_tag(name: str, suffix: str) -> str:
+    """Tag de tipo con emoji a partir de dos mapas precalculados (sin memo por nombre)."""
+    # El nombre especial tiene prioridad sobre la extensión
+    return _NAME_TYPE_TAGS.get(name) or _EXT_TYPE_TAGS.get(suffix.lower(), _DEFAULT_TYPE_TAG)
 
 def get_tags_for_file(file_path: Path) -> List[str]:
     """Devuelve lista de tags TiddlyWiki para `file_path`."""
     # Construir título basado en ruta (debe coincidir con safe_title del exporter)
     try:
-        repo_root = Path(__file__).resolve().parents[1]
-        rel = file_path.relative_to(repo_root)
+        rel = file_path.relative_to(_REPO_ROOT)
         title = rel.as_posix()
     except Exception:
         title = file_path.name
 
     # Cargar tags personalizados si existen
-    if title in title_to_tags:
-        tags = title_to_tags[title].copy()
+    custom = _get_title_map().get(title)
+    if custom:
+        tags = custom.copy()
     else:
-        # Derivar tag de tipo con emoji
-        name = file_path.name
-        ext = file_path.suffix.lower()
-        if name in SPECIAL_FILENAMES:
-            base = SPECIAL_FILENAMES[name]
-        elif ext in EXTENSION_TAG_MAP:
-            base = EXTENSION_TAG_MAP[ext]
-        else:
-            base = DEFAULT_TAG
-        if base == DEFAULT_TAG:
-            tags = [f"[[{base}]]"]
-        else:
-            tags = [f"[[⚙️ {base}]]"]
+        tags = [_type_tag(file_path.name, file_path.suffix)]
 
     # Tag basado en nombre de archivo (sin emoji)
     tags.append(f"[[{title}]]")
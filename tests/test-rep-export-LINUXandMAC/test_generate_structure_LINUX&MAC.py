@@ -42,8 +42,9 @@ def load_module():
     spec.loader.exec_module(module)
     return module
 
-@pytest.fixture
+@pytest.fixture(scope='session')
 def gs_module():
+    # Los tests no modifican el módulo: se ejecuta una sola vez por sesión
     return load_module()
 
 def test_ascii_tree_filters_hidden_and_ignored(gs_module, tmp_path):
@@ -85,33 +86,52 @@ def test_ascii_tree_filters_hidden_and_ignored(gs_module, tmp_path):
     for excl in ['.git', '__pycache__', 'node_modules', 'secret.pyc', '.DS_Store']:
         assert excl not in output, f"Se encontró elemento excluido: {excl}"
 
-def test_honor_gitignore(gs_module, tmp_path):
-    # Crea .gitignore que excluye "keep"
-    (tmp_path / '.gitignore').write_text('keep\n')
-
-    # Archivos/directorios de prueba
-    (tmp_path / 'keep').mkdir()
-    (tmp_path / 'other').mkdir()
-
-    args = argparse.Namespace(
-        exclude=[],
-        honor_gitignore=True,
-        exclude_from=None,
-        verbose=0
-    )
-    ignore_spec = gs_module.load_ignore_spec(tmp_path)  # <-- Cambiado
-    lines = gs_module.ascii_tree(
-        root=tmp_path,
-        repo_root=tmp_path,
-        prefix='',
-        args=args,
-        ignore_spec=ignore_spec  # <-- Cambiado
-    )
-    output = "\n".join(lines)
-
-    # "other" debe quedar, "keep" no
-    assert 'other' in output
-    assert 'keep' not in output
+@pytest.mark.parametrize('gitignore, entries, kept, dropped', [
+    # Nombre simple: excluye el directorio "keep"
+    ('keep\n', ['keep/', 'other/'], ['other'], ['keep']),
+    # Comodín sobre archivos
+    ('*.log\n', ['a.log', 'b.txt'], ['b.txt'], ['a.log']),
+    # Patrón de directorio (barra final): solo casa si la ruta se consulta con '/'
+    ('generated/\n', ['generated/out.txt', 'src/'], ['src'], ['generated', 'out.txt']),
+])
+def test_honor_gitignore(gs_module, tmp_path, gitignore, entries, kept, dropped):
+    (tmp_path / '.gitignore').write_text(gitignore)
+    for entry in entries:
+        target = tmp_path / entry
+        if entry.endswith('/'):
+            target.mkdir()
+        else:
+            target.parent.mkdir(exist_ok=True)
+            target.write_text('x')
+
+    args = argparse.Namespace(exclude=[], honor_gitignore=True, exclude_from=None, verbose=0)
+    ignore_spec = gs_module.load_ignore_spec(tmp_path)
+    output = "\n".join(gs_module.ascii_tree(
+        root=tmp_path, repo_root=tmp_path, prefix='', args=args, ignore_spec=ignore_spec
+    ))
+
+    for name in kept:
+        assert name in output
+    for name in dropped:
+        assert name not in output
+
+def test_is_ignored_directory_pattern(gs_module, tmp_path):
+    # is_ignored debe reconocer el directorio sin '/' explícita, sin depender del CWD
+    repo = tmp_path / 'repo'
+    repo.mkdir()
+    (repo / '.gitignore').write_text('generated/\n')
+    (repo / 'generated').mkdir()
+    (repo / 'src').mkdir()
+    ignore_spec = gs_module.load_ignore_spec(repo)
+
+    # Tipo conocido por el llamador (DirEntry)
+    assert is_ignored(Path('generated'), ignore_spec, is_dir=True)
+    assert not is_ignored(Path('generated'), ignore_spec, is_dir=False)
+    assert not is_ignored(Path('src'), ignore_spec, is_dir=True)
+    # Tipo consultado en disco contra repo_root, relativo o absoluto
+    assert is_ignored(Path('generated'), ignore_spec, repo_root=repo)
+    assert is_ignored(repo / 'generated', ignore_spec, repo_root=repo)
+    assert not is_ignored(Path('src'), ignore_spec, repo_root=repo)
 
 def test_write_atomic_creates_file(gs_module, tmp_path):
     # Probar que write_atomic crea y escribe correctamente
@@ -128,3 +148,48 @@ def test_write_atomic_creates_file(gs_module, tmp_path):
     if os.name != 'nt':
         mode = out_file.stat().st_mode & 0o777
         assert mode == 0o600
+
+
+def test_write_atomic_streams_tree_generator(gs_module, tmp_path):
+    repo = tmp_path / 'repo'
+    (repo / 'src').mkdir(parents=True)
+    (repo / 'src' / 'main.py').write_text('x')
+    (repo / 'README.md').write_text('x')
+    args = argparse.Namespace(exclude=[], honor_gitignore=False)
+    expected = gs_module.ascii_tree(repo, repo, args=args)
+
+    # Salida dentro del árbol recorrido, como en main(): el temporal no debe aparecer
+    out_file = repo / 'estructura.txt'
+    gs_module.write_atomic(out_file, gs_module.iter_ascii_tree(repo, repo, args=args))
+
+    written = out_file.read_text(encoding='utf-8')
+    assert written == '\n'.join(expected)
+    assert not any(line.split()[-1].startswith(('tmp', '.estructura')) for line in written.splitlines())
+
+
+def test_write_atomic_removes_temp_on_error(gs_module, tmp_path):
+    def failing_lines():
+        yield 'root'
+        raise OSError('directorio borrado durante el recorrido')
+
+    out_file = tmp_path / 'estructura.txt'
+    with pytest.raises(OSError):
+        gs_module.write_atomic(out_file, failing_lines())
+
+    assert not out_file.exists()
+    assert not list(tmp_path.glob('*.tmp'))
+
+
+def test_compile_exclude_matches_fnmatch(gs_module):
+    import fnmatch
+    extra = ('docs/*.md', 'tmp', 'cache/*', '*.log')
+    is_excluded = gs_module.compile_exclude(extra)
+    patterns = set(extra) | gs_module.ALWAYS_EXCLUDE
+    samples = [
+        '.env', 'a/.env', 'node_modules/', 'node_modules/pkg/index.js', 'node_modulesX/',
+        'build/', 'src/build/', 'key.pem', 'src/id.key', 'docs/a.md', 'docs/sub/a.md',
+        'tmp', 'tmp/', 'cache/', 'cache/x', 'app.log', 'src/main.py', '.git/HEAD',
+    ]
+    for rel in samples:
+        expected = any(fnmatch.fnmatch(rel, pat) for pat in patterns)
+        assert is_excluded(os.path.normcase(rel)) == expected, rel
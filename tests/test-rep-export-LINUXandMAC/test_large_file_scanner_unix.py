@@ -190,3 +190,13 @@ def test_export_tiddlers_includes_large_when_flag_set(tmp_path, monkeypatch):
     mod.export_tiddlers(dry_run=False, include_large=True, large_action="preview")
     exported = [f.name for f in out_dir.glob("*.json")]
     assert any("big" in f for f in exported)
+
+
+def test_build_large_tiddler_preview_uses_requested_bytes(tmp_path, monkeypatch):
+    mod, repo_dir = _load_exporter(tmp_path, monkeypatch)
+    large_file = repo_dir / "large.py"
+    large_file.write_text("A" * 10_000 + "B" * 10_000, encoding="utf-8")
+
+    tiddler = mod.build_large_tiddler(large_file, action="preview", preview_bytes=8192)
+    assert tiddler["text"].count("A") == 8192
+    assert "AB" not in tiddler["text"]
@@ -1,3 +1,4 @@
+import os
 import sys
 from pathlib import Path
 
@@ -22,9 +23,22 @@ import pytest
 from cli_utils_UNIX import load_ignore_spec, is_ignored
 
 
+@pytest.fixture(scope="session")
+def _exporter_module():
+    """Carga el módulo una sola vez por sesión; cada test parchea sus rutas."""
+    project_root = Path(__file__).resolve().parents[2]
+    module_path = project_root / "rep_export_LINUXandMAC" / "tiddler_exporter_UNIX.py"
+    spec = importlib.util.spec_from_file_location("tiddler_exporter", str(module_path))
+    mod = importlib.util.module_from_spec(spec)
+    sys.modules["tiddler_exporter"] = mod
+    spec.loader.exec_module(mod)
+    return mod
+
+
 @pytest.fixture
-def tiddler_exporter(tmp_path, monkeypatch):
-    """Prepara un entorno temporal y carga dinámicamente el módulo."""
+def tiddler_exporter(_exporter_module, tmp_path, monkeypatch):
+    """Prepara un entorno temporal y apunta el módulo a él."""
+    mod = _exporter_module
     # Crear estructura de proyecto falsa
     repo_dir = tmp_path / "repo"
     repo_dir.mkdir()
@@ -36,13 +50,6 @@ def tiddler_exporter(tmp_path, monkeypatch):
     (repo_dir / "config.toml").write_text("[project]\nname = 'test'")
 
     # Redefinir ROOT_DIR para apuntar al repo falso
-    project_root = Path(__file__).resolve().parents[2]
-    module_path = project_root / "rep_export_LINUXandMAC" / "tiddler_exporter_UNIX.py"
-    spec = importlib.util.spec_from_file_location("tiddler_exporter", str(module_path))
-    mod = importlib.util.module_from_spec(spec)
-    sys.modules["tiddler_exporter"] = mod
-    spec.loader.exec_module(mod)
-
     monkeypatch.setattr(mod, "ROOT_DIR", repo_dir)
     monkeypatch.setattr(mod, "OUTPUT_DIR", repo_dir / "tiddlers-export")
     monkeypatch.setattr(mod, "HASH_FILE", repo_dir / ".hashes.json")
@@ -67,4 +74,183 @@ def test_toml_files_are_exported(tiddler_exporter):
     out_file = tiddler_exporter.OUTPUT_DIR / "config.toml.json"
     assert out_file.exists(), "Archivo .toml no fue exportado correctamente"
     content = json.loads(out_file.read_text(encoding="utf-8"))
-    assert "project" in content["text"], "Contenido del archivo .toml no fue exportado correctamente"
\ No newline at end of file
+    assert "project" in content["text"], "Contenido del archivo .toml no fue exportado correctamente"
+
+def test_gitignored_directory_is_never_scanned(tiddler_exporter, monkeypatch):
+    repo_dir = tiddler_exporter.ROOT_DIR
+    (repo_dir / ".gitignore").write_text("build/\n")
+    deep = repo_dir / "build" / "deep"
+    deep.mkdir(parents=True)
+    (deep / "artifact.py").write_text("x = 1")
+    monkeypatch.setattr(tiddler_exporter, "IGNORE_SPEC", tiddler_exporter.load_ignore_spec(repo_dir))
+
+    scanned = []
+    real_scandir = os.scandir
+
+    def spy_scandir(path):
+        scanned.append(Path(path))
+        return real_scandir(path)
+
+    monkeypatch.setattr(tiddler_exporter.os, "scandir", spy_scandir)
+    files = [path.name for path, _, _ in tiddler_exporter.get_all_files()]
+
+    assert "artifact.py" not in files
+    assert "visible.py" in files
+    assert all("build" not in p.parts for p in scanned), f"Se recorrió un directorio ignorado: {scanned}"
+
+
+def test_batched_writes_export_every_changed_file(tiddler_exporter):
+    # Más archivos que hilos: todos deben llegar completos a disco
+    repo_dir = tiddler_exporter.ROOT_DIR
+    total = tiddler_exporter.EXPORT_WORKERS * 3
+    for i in range(total):
+        (repo_dir / f"mod_{i}.py").write_text(f"VALUE = {i}\n" * 50)
+    tiddler_exporter.export_tiddlers(dry_run=False)
+    for i in range(total):
+        out_file = tiddler_exporter.OUTPUT_DIR / f"mod_{i}.py.json"
+        data = json.loads(out_file.read_text(encoding="utf-8"))
+        assert f"VALUE = {i}" in data["text"]
+
+
+def test_well_known_dirs_are_pruned_without_gitignore(tiddler_exporter):
+    root = tiddler_exporter.ROOT_DIR
+    for d in ("node_modules/pkg", ".venv/lib", ".git"):
+        (root / d).mkdir(parents=True)
+        (root / d / "mod.py").write_text("x = 1")
+    names = [rel for _, rel, _ in tiddler_exporter.get_all_files()]
+    assert "visible.py" in names
+    assert not any("mod.py" in n for n in names)
+
+
+def test_load_ignore_spec_reuses_compiled_spec(tmp_path):
+    gitignore = tmp_path / ".gitignore"
+    gitignore.write_text("*.log\n")
+    spec = load_ignore_spec(tmp_path)
+    assert load_ignore_spec(tmp_path) is spec
+
+    gitignore.write_text("*.tmp\n*.bak\n")
+    changed = load_ignore_spec(tmp_path)
+    assert changed is not spec
+    assert changed.match_file("a.tmp") and not changed.match_file("a.log")
+
+
+def test_write_bytes_truncates_existing_file(tiddler_exporter, tmp_path):
+    target = tmp_path / "out.json"
+    target.write_bytes(b"x" * 1000)
+    tiddler_exporter.write_bytes(target, "{\"ñ\": 1}".encode("utf-8"))
+    assert json.loads(target.read_text(encoding="utf-8")) == {"ñ": 1}
+
+
+def test_hash_file_is_replaced_atomically(tiddler_exporter, monkeypatch):
+    tiddler_exporter.export_tiddlers(dry_run=False)
+    before = tiddler_exporter.HASH_FILE.read_bytes()
+
+    def fail(*args, **kwargs):
+        raise OSError("disco lleno")
+
+    monkeypatch.setattr(tiddler_exporter.os, "replace", fail)
+    (tiddler_exporter.ROOT_DIR / "visible.py").write_text("print('cambio')")
+    with pytest.raises(OSError):
+        tiddler_exporter.export_tiddlers(dry_run=False)
+    assert tiddler_exporter.HASH_FILE.read_bytes() == before
+
+
+def test_write_if_changed_skips_identical_payload(tiddler_exporter, tmp_path):
+    target = tmp_path / "out.json"
+    assert tiddler_exporter.write_if_changed(target, b"{}")
+    os.utime(target, ns=(0, 0))
+    assert not tiddler_exporter.write_if_changed(target, b"{}")
+    assert target.stat().st_mtime_ns == 0
+    assert tiddler_exporter.write_if_changed(target, b"[]")
+    assert target.read_bytes() == b"[]"
+
+
+def test_unchanged_files_are_not_rehashed(tiddler_exporter, monkeypatch):
+    tiddler_exporter.export_tiddlers(dry_run=False)
+    hashed = []
+    real = Path.read_bytes
+    monkeypatch.setattr(Path, "read_bytes", lambda p: hashed.append(p.name) or real(p))
+    (tiddler_exporter.ROOT_DIR / "visible.py").write_text("print('changed!')")
+    tiddler_exporter.export_tiddlers(dry_run=False)
+    # Solo el archivo modificado se vuelve a leer; el resto se decide por mtime/tamaño
+    # (.hashes.json vive dentro del repo de prueba y cambia en cada ejecución)
+    assert [n for n in hashed if n != ".hashes.json"] == ["visible.py"]
+
+
+def test_legacy_string_hash_entries_are_accepted(tiddler_exporter):
+    repo_dir = tiddler_exporter.ROOT_DIR
+    legacy = {"visible.py": tiddler_exporter.hash_file_streaming(repo_dir / "visible.py")}
+    tiddler_exporter.HASH_FILE.write_text(json.dumps(legacy), encoding="utf-8")
+    tiddler_exporter.export_tiddlers(dry_run=False)
+    assert not (tiddler_exporter.OUTPUT_DIR / "visible.py.json").exists()
+    entry = json.loads(tiddler_exporter.HASH_FILE.read_text(encoding="utf-8"))["visible.py"]
+    assert entry["hash"] == legacy["visible.py"]
+
+
+def test_dumps_json_is_compact_utf8(tiddler_exporter):
+    tiddler = {"title": "ñandú.py", "text": "```python\nprint('á')\n```", "tags": "[[⚙️ Python]]"}
+    data = tiddler_exporter.dumps_json(tiddler)
+    assert isinstance(data, bytes)
+    assert json.loads(data.decode("utf-8")) == tiddler
+    assert b"\n " not in data and "ñandú".encode("utf-8") in data
+    assert tiddler_exporter.loads_json(data) == tiddler
+
+
+def test_racily_clean_file_is_rehashed(tiddler_exporter):
+    # Mismo tamaño y mismo mtime que la entrada guardada, pero mtime no anterior a
+    # .hashes.json: el cambio pudo ocurrir en el mismo tick y debe detectarse
+    tiddler_exporter.export_tiddlers(dry_run=False)
+    src = tiddler_exporter.ROOT_DIR / "visible.py"
+    stored = json.loads(tiddler_exporter.HASH_FILE.read_text(encoding="utf-8"))["visible.py"]
+    hashes_mtime = tiddler_exporter.HASH_FILE.stat().st_mtime_ns
+    src.write_text("print('KO')")
+    os.utime(src, ns=(hashes_mtime, hashes_mtime))
+    stored["mtime"] = hashes_mtime
+    data = json.loads(tiddler_exporter.HASH_FILE.read_text(encoding="utf-8"))
+    data["visible.py"] = stored
+    tiddler_exporter.HASH_FILE.write_text(json.dumps(data), encoding="utf-8")
+    os.utime(tiddler_exporter.HASH_FILE, ns=(hashes_mtime, hashes_mtime))
+
+    tiddler_exporter.export_tiddlers(dry_run=False)
+    out = next(tiddler_exporter.OUTPUT_DIR.glob("visible.py*.json"))
+    assert "KO" in out.read_text(encoding="utf-8")
+
+
+def test_detect_language_keeps_names_and_suffixes_apart():
+    detect = tag_mapper_UNIX.detect_language
+    assert detect(Path(".gitignore")) == "gitignore"
+    # '.gitignore' es un nombre especial, no una extensión
+    assert detect(Path("x.gitignore")) == "text"
+    assert detect(Path("main.py")) == "python"
+
+
+def test_type_tag_keeps_names_and_suffixes_apart():
+    mapper = tag_mapper_UNIX
+    default = f"[[{mapper.DEFAULT_TAG}]]"
+    # Un archivo normal cuya extensión coincide con un nombre especial no hereda su tag
+    assert mapper.get_tags_for_file(Path("x.gitignore"))[0] == default
+    # Un archivo llamado como una extensión tampoco hereda el tag de esa extensión
+    assert mapper.get_tags_for_file(Path(".py"))[0] == default
+    assert mapper.get_tags_for_file(Path("Makefile"))[0] == "[[⚙️ Makefile]]"
+    assert mapper.get_tags_for_file(Path("main.py"))[0] == "[[⚙️ Python]]"
+
+
+def test_title_map_loads_once_across_threads(monkeypatch, tmp_path, capsys):
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+    mapper = tag_mapper_UNIX
+    (tmp_path / "roto.json").write_text("{", encoding="utf-8")
+    monkeypatch.setattr(mapper, "TIDDLER_TAG_DIR", tmp_path)
+    monkeypatch.setattr(mapper, "_title_to_tags", None)
+    barrier = threading.Barrier(8)
+
+    def load(_):
+        barrier.wait()
+        return mapper._get_title_map()
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        maps = list(pool.map(load, range(8)))
+
+    # Un único mapa compartido y un único aviso por JSON roto
+    assert all(m is maps[0] for m in maps)
+    assert capsys.readouterr().out.count("Error leyendo roto.json") == 1
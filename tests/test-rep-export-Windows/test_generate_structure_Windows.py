@@ -21,8 +21,8 @@ def load_module():
     project_root = Path(__file__).resolve().parents[2]
     module_path = project_root / "rep_export_Windows" / "generate_structure_windows.py"
 
-    # Asegurarnos de poder importar cli_utils desde rep-export-Windows/
-    windows_pkg = project_root / "rep-export-Windows"
+    # Asegurarnos de poder importar cli_utils desde rep_export_Windows/
+    windows_pkg = project_root / "rep_export_Windows"
     if str(windows_pkg) not in sys.path:
         sys.path.insert(0, str(windows_pkg))
 
@@ -32,8 +32,9 @@ def load_module():
     return module
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def gs_module():
+    # Los tests no modifican el módulo: se ejecuta una sola vez por sesión
     return load_module()
 
 
@@ -102,3 +103,35 @@ def test_write_atomic_creates_file(gs_module, tmp_path):
     assert out_file.exists()
     content = out_file.read_text(encoding="utf-8")
     assert "root" in content and "file.txt" in content
+
+
+def test_write_atomic_streams_tree_inside_scanned_repo(gs_module, tmp_path):
+    gen = gs_module
+    repo = tmp_path / "repo"
+    (repo / "src").mkdir(parents=True)
+    (repo / "src" / "main.py").write_text("x")
+    args = argparse.Namespace(exclude=[], honor_gitignore=False)
+    expected = gen.ascii_tree(repo, repo, args=args)
+
+    # Salida dentro del árbol recorrido, como en main(): el temporal no debe aparecer
+    out_file = repo / "estructura.txt"
+    gen.write_atomic(out_file, gen.iter_ascii_tree(repo, repo, args=args))
+
+    written = out_file.read_text(encoding="utf-8")
+    assert written == "\n".join(expected)
+    assert not any(line.split()[-1].startswith(("tmp", ".estructura")) for line in written.splitlines())
+
+
+def test_write_atomic_removes_temp_on_error(gs_module, tmp_path):
+    gen = gs_module
+
+    def failing_lines():
+        yield "root"
+        raise OSError("directorio borrado durante el recorrido")
+
+    out_file = tmp_path / "estructura.txt"
+    with pytest.raises(OSError):
+        gen.write_atomic(out_file, failing_lines())
+
+    assert not out_file.exists()
+    assert not list(tmp_path.glob("*.tmp"))